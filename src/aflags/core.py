@@ -2,16 +2,203 @@
 Core functionality for AFlags feature flag system.
 """
 
-import hashlib
-import random
+import math
+import os
+import re
+import struct
+import zlib
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Dict, Optional, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
 
 # Constants for percentage and per-thousand values
 MAX_PERCENTAGE = 100
 MAX_PER_THOUSAND = 1000
 
+HashAlgo = Literal["crc32", "mmh3", "sha256", "sha256-legacy"]
+
+# Hash algorithm used when a flag does not choose one; override with AFLAGS_HASH
+DEFAULT_HASH_ALGO = os.environ.get("AFLAGS_HASH", "mmh3").lower()
+
+# Hash values are split into 64-bit halves for vectorized bucketing
+_UINT64_MASK = (1 << 64) - 1
+
+# Maximum number of (flag, user) decisions memoized by a manager
+DECISION_CACHE_SIZE = 100_000
+
+
+# Bucketing hash algorithms supported by FeatureFlag
+HASH_ALGOS = frozenset(("crc32", "mmh3", "sha256", "sha256-legacy"))
+
+# Checked once here, since flags built with _unchecked() rely on the default
+if DEFAULT_HASH_ALGO not in HASH_ALGOS:
+    raise ValueError(f"Invalid hash algorithm '{DEFAULT_HASH_ALGO}' in AFLAGS_HASH")
+
+
+@lru_cache(maxsize=None)
+def _load_hasher(hash_algo: str) -> Callable[[bytes, int], Callable[[bytes], int]]:
+    """Import the hash function for an algorithm the first time it is needed.
+
+    Boolean-only applications never hash user IDs, so they never import mmh3
+    or hashlib.
+
+    Args:
+        hash_algo: One of HASH_ALGOS.
+
+    Returns:
+        Callable: Factory taking a flag's "name:" prefix and bucket count and
+        returning a function that hashes prefix + user ID bytes into a
+        uniformly distributed integer.
+
+    Raises:
+        ValueError: If the hash algorithm is not one of HASH_ALGOS.
+    """
+    if hash_algo == "mmh3":
+        import mmh3
+
+        def mmh3_hasher(prefix: bytes, max_value: int) -> Callable[[bytes], int]:
+            hash128 = mmh3.hash128
+            return lambda data: hash128(prefix + data, signed=False)
+
+        return mmh3_hasher
+
+    if hash_algo == "sha256":
+        import hashlib
+
+        unpack_uint64 = struct.Struct(">Q").unpack_from
+
+        def sha256_hasher(prefix: bytes, max_value: int) -> Callable[[bytes], int]:
+            # Feed the prefix once; each call only copies the state and adds the ID
+            prefix_state = hashlib.sha256(prefix)
+
+            def sha256_hash(data: bytes) -> int:
+                state = prefix_state.copy()
+                state.update(data)
+                # The first 8 digest bytes are already uniform; no need for an RNG
+                return unpack_uint64(state.digest())[0]
+
+            return sha256_hash
+
+        return sha256_hasher
+
+    if hash_algo == "crc32":
+
+        def crc32_hasher(prefix: bytes, max_value: int) -> Callable[[bytes], int]:
+            # CRC32 can resume from the prefix checksum instead of concatenating
+            prefix_crc = zlib.crc32(prefix)
+            crc32 = zlib.crc32
+            return lambda data: crc32(data, prefix_crc)
+
+        return crc32_hasher
+
+    if hash_algo == "sha256-legacy":
+        import hashlib
+        import random
+
+        def sha256_legacy_hasher(
+            prefix: bytes, max_value: int
+        ) -> Callable[[bytes], int]:
+            # Assignment aflags 0.1.0 used: seed a random generator with the
+            # SHA-256 digest. The result is already a bucket below max_value.
+            def sha256_legacy_hash(data: bytes) -> int:
+                hash_bytes = hashlib.sha256(prefix + data).digest()
+                seed = int.from_bytes(hash_bytes[:8], byteorder="big")
+                return random.Random(seed).randint(0, max_value - 1)
+
+            return sha256_legacy_hash
+
+        return sha256_legacy_hasher
+
+    raise ValueError(f"Invalid hash algorithm '{hash_algo}'")
+
+
+@lru_cache(maxsize=None)
+def _load_random() -> Callable[[], float]:
+    """Import the random module the first time an anonymous check needs it."""
+    import random
+
+    return random.random
+
+
+def _import_numpy(feature: str) -> Any:
+    """Import NumPy for a vectorized API, explaining how to get it if missing.
+
+    Args:
+        feature: Name of the API that needs NumPy, used in the error message.
+
+    Returns:
+        The numpy module.
+    """
+    try:
+        import numpy as np
+    except ImportError as err:
+        raise ImportError(
+            f'{feature} requires NumPy: pip install "aflags[numpy]"'
+        ) from err
+    return np
+
+
+def _vector_buckets(np: Any, hashes: List[int], max_values: Any) -> "np.ndarray":
+    """Reduce hashes of up to 128 bits modulo max_values with uint64 arithmetic.
+
+    Each hash is split as high * 2**64 + low. Every intermediate term stays
+    below max_value**2, so the arithmetic never overflows uint64.
+
+    Args:
+        np: The numpy module.
+        hashes: Hash values to reduce.
+        max_values: uint64 modulus, either a scalar or one per hash.
+
+    Returns:
+        numpy.ndarray: The hash % max_value bucket of each hash.
+    """
+    count = len(hashes)
+    low = np.fromiter((h & _UINT64_MASK for h in hashes), np.uint64, count)
+    high = np.fromiter((h >> 64 for h in hashes), np.uint64, count)
+    wraps = (np.uint64(_UINT64_MASK) % max_values + np.uint64(1)) % max_values
+    return (high % max_values * wraps + low % max_values) % max_values
+
+
+def _build_flag_table(np: Any, flags: Mapping[str, "FeatureFlag"]) -> Tuple[Any, ...]:
+    """Lay flags out as parallel arrays for FeatureFlagManager.is_enabled_all.
+
+    Args:
+        np: The numpy module.
+        flags: Feature flags by name.
+
+    Returns:
+        Tuple of flag names, flags, and NumPy arrays of their type tag,
+        boolean value, bucket range and threshold.
+    """
+    values = list(flags.values())
+    return (
+        list(flags),
+        values,
+        np.array([flag._type_tag for flag in values], dtype=np.int8),
+        np.array(
+            [flag._is_boolean and bool(flag.value) for flag in values], dtype=bool
+        ),
+        np.array([flag._max_value for flag in values], dtype=np.uint64),
+        np.array([flag._value_int for flag in values], dtype=np.uint64),
+    )
+
 
 class FlagType(str, Enum):
     """Feature flag types."""
@@ -21,15 +208,106 @@ class FlagType(str, Enum):
     PER_THOUSAND = "per_thousand"
 
 
+# Flag types by string value; a dict lookup is cheaper than calling FlagType()
+# and never goes through Enum._missing_
+_FLAG_TYPE_BY_STR: Dict[str, FlagType] = {member.value: member for member in FlagType}
+
+# Small integer tag per flag type, used to dispatch in vectorized evaluation
+_TYPE_TAG: Dict[FlagType, int] = {
+    FlagType.BOOLEAN: 0,
+    FlagType.PERCENTAGE: 1,
+    FlagType.PER_THOUSAND: 2,
+}
+_BOOLEAN_TAG = _TYPE_TAG[FlagType.BOOLEAN]
+
+
+def _resolve_flag_type(type: Any) -> FlagType:
+    """Resolve a flag type given as a FlagType member or its string value.
+
+    Args:
+        type: Flag type.
+
+    Returns:
+        FlagType: The flag type.
+
+    Raises:
+        ValueError: If the type is not a known flag type.
+    """
+    # FlagType members hash and compare as their values, so one lookup
+    # resolves both members and plain strings
+    try:
+        flag_type = _FLAG_TYPE_BY_STR.get(type)
+    except TypeError:
+        flag_type = None  # Unhashable, e.g. a list read from a file
+    if flag_type is None:
+        raise ValueError(f"Invalid flag type: {type}")
+    return flag_type
+
+
+# Numeric value types, bound once so validators don't build the tuple per call
+_NUMERIC = (int, float)
+
+# Flag values as sources spell them in text: decimals such as 500, 750.5, 5.
+# or .5, with an optional minus sign so negative values get a range error.
+# A leading + is rejected, as the original digits-only check did
+_NUMBER_RE = re.compile(r"-?(?:[0-9]+\.?[0-9]*|\.[0-9]+)")
+
+
+def _validate_boolean(value: Any) -> None:
+    """Validate the value of a boolean flag."""
+    if not isinstance(value, bool):
+        raise ValueError("Boolean flag must have a boolean value")
+
+
+def _validate_percentage(value: Any) -> None:
+    """Validate the value of a percentage flag."""
+    if not isinstance(value, _NUMERIC):
+        raise ValueError("Percentage flag must have a numeric value")
+    if not 0 <= value <= MAX_PERCENTAGE:
+        raise ValueError(f"Percentage value must be between 0 and {MAX_PERCENTAGE}")
+
+
+def _validate_per_thousand(value: Any) -> None:
+    """Validate the value of a per-thousand flag."""
+    if not isinstance(value, _NUMERIC):
+        raise ValueError("Per-thousand flag must have a numeric value")
+    if not 0 <= value <= MAX_PER_THOUSAND:
+        raise ValueError(f"Per-thousand value must be between 0 and {MAX_PER_THOUSAND}")
+
+
+# Value validators by flag type; each raises ValueError for an invalid value
+_VALIDATORS: Dict[FlagType, Callable[[Any], None]] = {
+    FlagType.BOOLEAN: _validate_boolean,
+    FlagType.PERCENTAGE: _validate_percentage,
+    FlagType.PER_THOUSAND: _validate_per_thousand,
+}
+
+
 class FeatureFlag:
     """Represents a feature flag with its configuration."""
 
+    __slots__ = (
+        "_hash_algo",
+        "_hasher",
+        "_is_boolean",
+        "_max_value",
+        "_name",
+        "_random",
+        "_threshold_float",
+        "_type",
+        "_type_tag",
+        "_value",
+        "_value_int",
+        "description",
+    )
+
     def __init__(
         self,
         name: str,
         type: Union[str, FlagType],
         value: Union[bool, int, float],
         description: Optional[str] = None,
+        hash_algo: Optional[HashAlgo] = None,
     ):
         """Initialize a feature flag.
 
@@ -38,33 +316,128 @@ class FeatureFlag:
             type: Flag type (boolean, percentage, or per_thousand)
             value: Flag value
             description: Optional flag description
+            hash_algo: Hash used to bucket identified users (crc32, mmh3,
+                sha256, or sha256-legacy). Defaults to DEFAULT_HASH_ALGO.
         """
-        self.name = name
-        try:
-            self.type = type if isinstance(type, FlagType) else FlagType(type)
-        except ValueError as err:
-            raise ValueError("Invalid flag type") from err
-        self.value = value
+        self._name = name
+        self._type = _resolve_flag_type(type)
+        self._value = value
         self.description = description
+        self._hash_algo = hash_algo or DEFAULT_HASH_ALGO
+        if self._hash_algo not in HASH_ALGOS:
+            raise ValueError(f"Invalid hash algorithm '{self._hash_algo}'")
 
         # Validate value based on type
-        if self.type == FlagType.BOOLEAN:
-            if not isinstance(self.value, bool):
-                raise ValueError("Boolean flag must have a boolean value")
-        elif self.type == FlagType.PERCENTAGE:
-            if not isinstance(self.value, (int, float)):
-                raise ValueError("Percentage flag must have a numeric value")
-            if not 0 <= self.value <= MAX_PERCENTAGE:
-                raise ValueError(
-                    f"Percentage value must be between 0 and {MAX_PERCENTAGE}"
-                )
-        elif self.type == FlagType.PER_THOUSAND:
-            if not isinstance(self.value, (int, float)):
-                raise ValueError("Per-thousand flag must have a numeric value")
-            if not 0 <= self.value <= MAX_PER_THOUSAND:
-                raise ValueError(
-                    f"Per-thousand value must be between 0 and {MAX_PER_THOUSAND}"
-                )
+        _VALIDATORS[self._type](self._value)
+
+        self._prepare()
+
+    @classmethod
+    def _unchecked(
+        cls,
+        name: str,
+        type: FlagType,
+        value: Union[bool, int, float],
+        description: Optional[str] = None,
+        hash_algo: Optional[HashAlgo] = None,
+    ) -> "FeatureFlag":
+        """Build a feature flag from values that are already known to be valid.
+
+        Skips the validation done by __init__; only use it for values a source
+        has checked itself.
+
+        Args:
+            name: Flag name
+            type: Flag type
+            value: Flag value, valid for the flag type
+            description: Optional flag description
+            hash_algo: One of HASH_ALGOS. Defaults to DEFAULT_HASH_ALGO.
+
+        Returns:
+            FeatureFlag: The new feature flag.
+        """
+        flag = cls.__new__(cls)
+        flag._name = name
+        flag._type = type
+        flag._value = value
+        flag.description = description
+        flag._hash_algo = hash_algo or DEFAULT_HASH_ALGO
+        flag._prepare()
+        return flag
+
+    @property
+    def name(self) -> str:
+        """Flag name, part of the hash that buckets identified users."""
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+        self._prepare()
+
+    @property
+    def type(self) -> FlagType:
+        """Flag type."""
+        return self._type
+
+    @type.setter
+    def type(self, type: Union[str, FlagType]) -> None:
+        self._type = _resolve_flag_type(type)
+        self._prepare()
+
+    @property
+    def value(self) -> Union[bool, int, float]:
+        """Flag value."""
+        return self._value
+
+    @value.setter
+    def value(self, value: Union[bool, int, float]) -> None:
+        self._value = value
+        self._prepare()
+
+    @property
+    def hash_algo(self) -> str:
+        """Hash used to bucket identified users."""
+        return self._hash_algo
+
+    @hash_algo.setter
+    def hash_algo(self, hash_algo: Optional[HashAlgo]) -> None:
+        hash_algo = hash_algo or DEFAULT_HASH_ALGO
+        if hash_algo not in HASH_ALGOS:
+            raise ValueError(f"Invalid hash algorithm '{hash_algo}'")
+        self._hash_algo = hash_algo
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Precompute the attributes is_enabled uses from the flag's fields.
+
+        Runs again whenever name, type, value or hash_algo is assigned, so the
+        precomputed attributes never go stale.
+        """
+        # Precompute what is_enabled needs so it avoids Enum comparisons
+        self._type_tag = _TYPE_TAG[self._type]
+        self._is_boolean = self._type_tag == _BOOLEAN_TAG
+        self._max_value = (
+            MAX_PERCENTAGE if self._type == FlagType.PERCENTAGE else MAX_PER_THOUSAND
+        )
+        self._threshold_float = (
+            0.0 if self._is_boolean else self._value / self._max_value
+        )
+        # Buckets are integers, so bucket < value holds exactly when
+        # bucket < ceil(value); comparing ints avoids mixed int/float compares
+        self._value_int = 0 if self._is_boolean else math.ceil(self._value)
+
+        # Boolean flags never hash or roll, so they skip the imports entirely
+        if self._is_boolean:
+            self._hasher = None
+            self._random = None
+        else:
+            # Use both name and user_id to ensure different flags get different
+            # distributions
+            self._hasher = _load_hasher(self._hash_algo)(
+                f"{self._name}:".encode(), self._max_value
+            )
+            self._random = _load_random()
 
     def is_enabled(self, user_id: Optional[str] = None) -> bool:
         """Check if the feature flag is enabled.
@@ -75,42 +448,102 @@ class FeatureFlag:
         Returns:
             True if the feature flag is enabled for the user, False otherwise.
         """
-        if self.type == FlagType.BOOLEAN:
-            return bool(self.value)
+        if self._is_boolean:
+            return bool(self._value)
 
         if user_id is None:
             # For anonymous users, use random value
-            threshold = self.value / (100 if self.type == FlagType.PERCENTAGE else 1000)
-            return random.random() < threshold
+            return self._random() < self._threshold_float
 
         # For identified users, use consistent hashing with better distribution
-        # Use both name and user_id to ensure different flags get different distributions
-        hash_input = f"{self.name}:{user_id}".encode()
-        hash_bytes = hashlib.sha256(hash_input).digest()
+        user_value = self._hash(user_id) % self._max_value
+        return user_value < self._value_int
 
-        # Use the first 8 bytes as a seed for random number generation
-        seed = int.from_bytes(hash_bytes[:8], byteorder="big")
-        rng = random.Random(seed)
+    def is_enabled_batch(self, user_ids: Iterable[str]) -> "np.ndarray":
+        """Check if the feature flag is enabled for many identified users at once.
 
-        # Get a random number between 0 and max_value
-        max_value = 100 if self.type == FlagType.PERCENTAGE else 1000
-        user_value = rng.randint(0, max_value - 1)
+        Requires NumPy (``pip install "aflags[numpy]"``).
 
-        return user_value < self.value
+        Args:
+            user_ids: IDs of the users to check.
+
+        Returns:
+            numpy.ndarray: Boolean array with the result for each user, in order.
+        """
+        np = _import_numpy("is_enabled_batch")
+
+        if self._is_boolean:
+            return np.full(len(list(user_ids)), bool(self._value))
+
+        hashes = [self._hash(user_id) for user_id in user_ids]
+        buckets = _vector_buckets(np, hashes, np.uint64(self._max_value))
+        return buckets < self._value_int
+
+    def _hash(self, user_id: str) -> int:
+        """Hash the flag name and user ID into an unsigned integer.
+
+        Args:
+            user_id: ID of the user to hash. IDs that are not strings, such
+                as integer database IDs, are hashed as their str() form.
+
+        Returns:
+            int: Uniformly distributed hash value of at most 128 bits.
+        """
+        if type(user_id) is not str:
+            user_id = str(user_id)
+        return self._hasher(user_id.encode())
 
 
 class FeatureFlagSource(ABC):
     """Abstract base class for feature flag data sources."""
 
     @abstractmethod
-    def get_flags(self) -> Dict[str, FeatureFlag]:
+    def get_flags(self) -> Mapping[str, FeatureFlag]:
         """Get all feature flags from the source.
 
         Returns:
-            Dict[str, FeatureFlag]: Dictionary of feature flags
+            Mapping[str, FeatureFlag]: Feature flags by name
         """
         pass
 
+    async def get_flags_async(self) -> Mapping[str, FeatureFlag]:
+        """Get all feature flags from the source without blocking the event loop.
+
+        Runs get_flags() in a worker thread, so several sources can load
+        concurrently with asyncio.gather().
+
+        Returns:
+            Mapping[str, FeatureFlag]: Feature flags by name
+        """
+        # Imported here so synchronous users don't pay for loading asyncio
+        import asyncio
+
+        return await asyncio.to_thread(self.get_flags)
+
+
+class _ManagerState:
+    """Flags loaded by a manager, with the lookups derived from them.
+
+    reload() replaces the whole state in one assignment, so a reader that
+    took the state before the swap keeps a consistent view of the old flags
+    and only fills the old caches.
+    """
+
+    __slots__ = ("boolean_results", "decisions", "flag_table", "flags")
+
+    def __init__(self, flags: Mapping[str, FeatureFlag]):
+        """Derive the lookups for a set of flags.
+
+        Args:
+            flags: Feature flags by name.
+        """
+        self.flags = flags
+        self.boolean_results: Dict[str, bool] = {
+            name: bool(flag.value) for name, flag in flags.items() if flag._is_boolean
+        }
+        self.decisions: Dict[Tuple[str, str], bool] = {}
+        self.flag_table: Optional[Tuple[Any, ...]] = None
+
 
 class FeatureFlagManager:
     """Manages feature flags from a source."""
@@ -122,7 +555,7 @@ class FeatureFlagManager:
             source: The source to load feature flags from.
         """
         self._source = source
-        self._flags: Dict[str, FeatureFlag] = {}
+        self._state = _ManagerState({})
         self.reload()
 
     @classmethod
@@ -168,8 +601,19 @@ class FeatureFlagManager:
         return cls(EnvSource(prefix))
 
     def reload(self) -> None:
-        """Reload feature flags from the source."""
-        self._flags = self._source.get_flags()
+        """Reload feature flags from the source.
+
+        The new flags and their lookups are built before they replace the
+        current ones in a single assignment, so concurrent is_enabled calls see
+        either the previous state or the new one, never a mix.
+        If the source returns the same read-only mapping as the last load,
+        nothing changed and memoized decisions are kept. Other mappings may
+        have been updated in place, so they are always reloaded.
+        """
+        flags = self._source.get_flags()
+        if isinstance(flags, MappingProxyType) and flags is self._state.flags:
+            return
+        self._state = _ManagerState(flags)
 
     def is_enabled(self, flag_name: str, user_id: Optional[str] = None) -> bool:
         """Check if a feature flag is enabled.
@@ -181,5 +625,55 @@ class FeatureFlagManager:
         Returns:
             True if the feature flag is enabled for the user, False otherwise.
         """
-        flag = self._flags.get(flag_name)
-        return flag.is_enabled(user_id) if flag else False
+        # One snapshot, so a concurrent reload() cannot mix old and new state
+        state = self._state
+
+        # Boolean flags give the same answer for every user
+        result = state.boolean_results.get(flag_name)
+        if result is not None:
+            return result
+
+        flag = state.flags.get(flag_name)
+        if flag is None:
+            return False
+
+        # Anonymous checks must stay random
+        if user_id is None:
+            return flag.is_enabled(user_id)
+
+        decisions = state.decisions
+        key = (flag_name, user_id)
+        decision = decisions.get(key)
+        if decision is None:
+            if len(decisions) >= DECISION_CACHE_SIZE:
+                decisions.clear()
+            decision = decisions[key] = flag.is_enabled(user_id)
+        return decision
+
+    def is_enabled_all(self, user_id: Optional[str] = None) -> Dict[str, bool]:
+        """Check every feature flag for a user at once.
+
+        Requires NumPy (``pip install "aflags[numpy]"``) for identified users.
+        Flag values are kept in parallel arrays, so the bucket comparisons for
+        all flags run as a single vector operation.
+
+        Args:
+            user_id: Optional ID of the user to check. If None, treats as anonymous.
+
+        Returns:
+            Dict[str, bool]: Whether each feature flag is enabled for the user.
+        """
+        state = self._state
+        if user_id is None:
+            return {name: flag.is_enabled() for name, flag in state.flags.items()}
+
+        np = _import_numpy("is_enabled_all")
+        table = state.flag_table
+        if table is None:
+            table = state.flag_table = _build_flag_table(np, state.flags)
+        names, flags, type_tags, boolean_values, max_values, values = table
+
+        hashes = [0 if flag._is_boolean else flag._hash(user_id) for flag in flags]
+        buckets = _vector_buckets(np, hashes, max_values)
+        results = np.where(type_tags == _BOOLEAN_TAG, boolean_values, buckets < values)
+        return dict(zip(names, results.tolist()))
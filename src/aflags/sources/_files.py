@@ -0,0 +1,195 @@
+"""
+Base class and file helpers shared by the file-based feature flag sources.
+"""
+
+import os
+from abc import abstractmethod
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, TypeVar, Union
+
+from aflags.core import FeatureFlag, FeatureFlagSource
+
+# Smallest read after the first, so files whose reported size is 0, like
+# those in /proc, are still read in a few calls
+_MIN_CHUNK_SIZE = 64 * 1024
+
+# Windows opens files in text mode unless asked not to, which would translate
+# line endings and stop at the first Ctrl-Z
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Returned for missing files and empty documents. Sharing one read-only
+# mapping keeps the return type consistent and lets the manager see that
+# nothing changed between reloads
+NO_FLAGS: Mapping[str, FeatureFlag] = MappingProxyType({})
+
+# Per-path count of forced loads, part of the parse cache key so that forcing
+# one file only invalidates the cached parses of that file
+_FORCED_LOADS: Dict[str, int] = {}
+
+_FileSourceT = TypeVar("_FileSourceT", bound="FileSource")
+
+
+def read_file(file_path: str) -> bytes:
+    """Read a whole file with as few system calls as possible.
+
+    Flag files are small, so sizing the first read from fstat avoids the
+    chunked reads of a buffered file object.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        bytes: The file contents.
+    """
+    fd = os.open(file_path, _OPEN_FLAGS)
+    try:
+        # The size is only a hint: reads can return less than asked for, e.g.
+        # on network filesystems, and the file can grow after the fstat, so
+        # only an empty read marks the end of the file
+        size = os.fstat(fd).st_size
+        chunks = []
+        chunk = os.read(fd, size + 1)
+        while chunk:
+            chunks.append(chunk)
+            chunk = os.read(fd, max(size, _MIN_CHUNK_SIZE))
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def file_version(file_path: str) -> Tuple[int, int, int, int]:
+    """Identify the current version of a file from its stat fields.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        Tuple[int, int, int, int]: Device, inode, modification time in
+        nanoseconds and size, which change whenever the file is replaced or
+        written to.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    stat = os.stat(file_path)
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _load_flags(
+    parse: Callable[..., Mapping[str, FeatureFlag]],
+    file_path: str,
+    version: Tuple[int, int, int, int],
+    generation: int,
+    options: Tuple[Any, ...],
+) -> Mapping[str, FeatureFlag]:
+    """Parse a file into feature flags.
+
+    Results are cached per file version, passed alongside the path, so
+    unchanged files are not parsed again and sources reading the same file
+    with the same options share one result.
+
+    Args:
+        parse: Parser of the source's format, part of the cache key.
+        file_path: Path to the file containing feature flags.
+        version: File version from file_version(), part of the cache key.
+        generation: Number of forced loads of the file, part of the cache key.
+        options: Extra arguments for parse, part of the cache key.
+
+    Returns:
+        Mapping[str, FeatureFlag]: Read-only mapping of feature flags.
+    """
+    # The parsers accept bytes, which skips decoding the file to str first
+    return parse(read_file(file_path), *options)
+
+
+class FileSource(FeatureFlagSource):
+    """Base for sources that read feature flags from a file or a document.
+
+    Subclasses set _parse to the parser of their format, and _options to the
+    extra arguments it takes.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, "os.PathLike[str]", None] = None,
+        *,
+        content: Optional[Union[str, bytes]] = None,
+    ):
+        """Initialize the source.
+
+        Args:
+            file_path: Path to the file containing feature flags, as a string
+                or path-like object.
+            content: In-memory document to parse instead of a file, as given
+                to from_string().
+
+        Raises:
+            ValueError: If both or neither of file_path and content are given.
+        """
+        if (file_path is None) == (content is None):
+            raise ValueError("Pass either a file path or in-memory content")
+        # Converted once, since every get_flags() call passes the path to os
+        # functions and uses it in the parse cache key
+        self._file_path = None if file_path is None else os.fspath(file_path)
+        self._content: Union[str, bytes] = b"" if content is None else content
+        self._options: Tuple[Any, ...] = ()
+        self._flags: Optional[Mapping[str, FeatureFlag]] = None
+
+    @classmethod
+    def from_string(
+        cls: Type[_FileSourceT], content: Union[str, bytes], **options: Any
+    ) -> _FileSourceT:
+        """Create a source that reads feature flags from an in-memory document.
+
+        Args:
+            content: Document, as text or UTF-8 bytes.
+            **options: Options of the source class, as for its constructor.
+
+        Returns:
+            A source that parses content instead of a file.
+        """
+        return cls(content=content, **options)
+
+    @staticmethod
+    @abstractmethod
+    def _parse(content: Union[str, bytes], *options: Any) -> Mapping[str, FeatureFlag]:
+        """Parse a document into a read-only mapping of feature flags."""
+
+    def get_flags(self, force: bool = False) -> Mapping[str, FeatureFlag]:
+        """Get all feature flags from the file or in-memory document.
+
+        Args:
+            force: Parse the file again even if it looks unchanged since the
+                last load, or the in-memory document again.
+
+        Returns:
+            Mapping[str, FeatureFlag]: Read-only mapping of feature flags, the
+            same object as long as the file is unchanged.
+
+        Raises:
+            ValueError: If the document contains invalid feature flag
+                configuration.
+        """
+        # In-memory documents never change, so they are parsed once
+        if self._file_path is None:
+            if force or self._flags is None:
+                self._flags = self._parse(self._content, *self._options)
+            return self._flags
+
+        # Cached parses are keyed by file version, which can miss edits made
+        # within the filesystem's timestamp resolution
+        if force:
+            _FORCED_LOADS[self._file_path] = _FORCED_LOADS.get(self._file_path, 0) + 1
+        generation = _FORCED_LOADS.get(self._file_path, 0)
+
+        # A missing file means no flags, whether it is gone before the stat or
+        # removed between the stat and the open
+        try:
+            version = file_version(self._file_path)
+            return _load_flags(
+                self._parse, self._file_path, version, generation, self._options
+            )
+        except FileNotFoundError:
+            return NO_FLAGS
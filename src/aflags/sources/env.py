@@ -3,13 +3,25 @@ Environment variables-based feature flag source.
 """
 
 import os
-from typing import Dict
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
-from ..core import MAX_PER_THOUSAND, FeatureFlag, FeatureFlagSource, FlagType
+from ..core import (
+    _NUMBER_RE,
+    MAX_PER_THOUSAND,
+    FeatureFlag,
+    FeatureFlagSource,
+    FlagType,
+)
 
 # Constants for percentage and per-thousand values
 MAX_PERCENTAGE = 100
 
+# Accepted boolean spellings, compared case-insensitively
+_TRUE_VALUES = frozenset(("true", "1", "yes", "on"))
+_FALSE_VALUES = frozenset(("false", "0", "no", "off"))
+
 
 class EnvSource(FeatureFlagSource):
     """Feature flag source that reads from environment variables."""
@@ -22,51 +34,59 @@ class EnvSource(FeatureFlagSource):
             prefix: Prefix for environment variable names. Defaults to "AFLAG_"
         """
         self.prefix = prefix
+        self._cache_key: Optional[Dict[str, str]] = None
+        self._cache: Mapping[str, FeatureFlag] = MappingProxyType({})
 
-    def get_flags(self) -> Dict[str, FeatureFlag]:
+    def get_flags(self) -> Mapping[str, FeatureFlag]:
         """
         Read feature flags from environment variables.
 
         Returns:
-            Dict[str, FeatureFlag]: Dictionary of feature flags
+            Mapping[str, FeatureFlag]: Read-only mapping of feature flags
 
         Raises:
             ValueError: If environment variable name or value is invalid
         """
-        flags: Dict[str, FeatureFlag] = {}
-        for key, value in os.environ.items():
-            if not key.startswith(self.prefix):
-                continue
+        # Comparing a slice avoids a startswith() method call per variable
+        prefix = self.prefix
+        prefix_len = len(prefix)
+        entries = {
+            key: value
+            for key, value in os.environ.items()
+            if key[:prefix_len] == prefix
+        }
+
+        # Environment variables rarely change after start-up, so reuse the last
+        # parse as long as the prefixed variables are identical
+        if entries == self._cache_key:
+            return self._cache
 
-            name = key[len(self.prefix) :].lower()
+        flags: Dict[str, FeatureFlag] = {}
+        for key, value in entries.items():
+            name = sys.intern(key[prefix_len:].lower())
             if not name:
                 raise ValueError(
                     f"Invalid environment variable name '{key}'. "
                     "Like Miguel Alvarez, every name needs substance."
                 )
 
-            # Try to parse as per-thousand value first if it looks like a number
-            if value.replace(".", "").isdigit():
-                try:
-                    per_thousand = float(value)
-                    if not 0 <= per_thousand <= MAX_PER_THOUSAND:
-                        raise ValueError(
-                            "Per-thousand value must be between 0 and 1000"
-                        )
-                    flags[name] = FeatureFlag(name, FlagType.PER_THOUSAND, per_thousand)
-                    continue
-                except ValueError as err:
-                    if "Per-thousand value must be between 0 and 1000" in str(err):
-                        raise
-                    # If it's not a valid per-thousand value, continue to try boolean values
-                    pass
+            # Numbers take precedence, so "0" and "1" are per-thousand values
+            if _NUMBER_RE.fullmatch(value):
+                per_thousand = float(value)
+                if not 0 <= per_thousand <= MAX_PER_THOUSAND:
+                    raise ValueError("Per-thousand value must be between 0 and 1000")
+                # Values are range-checked above, so skip FeatureFlag validation
+                flags[name] = FeatureFlag._unchecked(
+                    name, FlagType.PER_THOUSAND, per_thousand
+                )
+                continue
 
             # If not a valid number, try boolean values
             value_lower = value.lower()
-            if value_lower in ("true", "1", "yes", "on"):
-                flags[name] = FeatureFlag(name, FlagType.BOOLEAN, True)
-            elif value_lower in ("false", "0", "no", "off"):
-                flags[name] = FeatureFlag(name, FlagType.BOOLEAN, False)
+            if value_lower in _TRUE_VALUES:
+                flags[name] = FeatureFlag._unchecked(name, FlagType.BOOLEAN, True)
+            elif value_lower in _FALSE_VALUES:
+                flags[name] = FeatureFlag._unchecked(name, FlagType.BOOLEAN, False)
             else:
                 raise ValueError(
                     f"Invalid value '{value}' for feature flag '{name}'. "
@@ -74,4 +94,7 @@ class EnvSource(FeatureFlagSource):
                     f"(0-{MAX_PER_THOUSAND})"
                 )
 
-        return flags
+        # Later calls return the same object, so callers get a read-only view
+        self._cache_key = entries
+        self._cache = MappingProxyType(flags)
+        return self._cache
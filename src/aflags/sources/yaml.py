@@ -2,102 +2,375 @@
 YAML file-based feature flag source.
 """
 
-from pathlib import Path
-from typing import Dict
+import os
+import re
+import sys
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
 
 import yaml
+from yaml import (
+    DocumentEndEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    StreamEndEvent,
+)
 
-from aflags.core import FeatureFlag, FeatureFlagSource
+try:
+    # The libyaml-based loaders parse several times faster than the Python ones
+    from yaml import CBaseLoader as _BaseLoader
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import BaseLoader as _BaseLoader
+    from yaml import SafeLoader as _SafeLoader
 
-# Constants for percentage and per-thousand values
-MAX_PERCENTAGE = 100
-MAX_PER_THOUSAND = 1000
+from aflags.core import FeatureFlag
+from aflags.sources._files import NO_FLAGS, FileSource
 
+# Files smaller than this are parsed in-process even in parallel mode, since
+# starting the worker pool costs more than it saves
+PARALLEL_MIN_SIZE = 1_000_000
 
-class YamlSource(FeatureFlagSource):
-    """Feature flag source that reads from a YAML file."""
+# Document start lines, where parallel mode splits a file; "---" lines with
+# a trailing comment or CRLF ending count, markers followed by content do not
+_DOCUMENT_SEPARATOR = re.compile(rb"^---[ \t]*(?:#[^\n]*)?\r?$", re.MULTILINE)
 
-    def __init__(self, file_path: str):
-        """Initialize the YAML source.
+# Fast mode loads every scalar as a string; these convert flag values back
+# using the YAML 1.1 spellings SafeLoader resolves: lowercase, capitalized or
+# uppercase booleans, and nulls
+_FAST_BOOLEANS = {
+    spelling: boolean
+    for word, boolean in (
+        ("true", True),
+        ("yes", True),
+        ("on", True),
+        ("false", False),
+        ("no", False),
+        ("off", False),
+    )
+    for spelling in (word, word.capitalize(), word.upper())
+}
+_FAST_NULLS = frozenset(("", "~", "null", "Null", "NULL"))
 
-        Args:
-            file_path: Path to the YAML file containing feature flags.
-        """
-        self._file_path = file_path
+# Decimals as SafeLoader spells ints and floats. Unlike environment values,
+# these take a leading +, which SafeLoader reads as a positive number
+_FAST_NUMBER_RE = re.compile(r"[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)")
 
-    def get_flags(self) -> Dict[str, FeatureFlag]:
-        """Get all feature flags from the YAML file.
+# Numbers SafeLoader reads differently from a plain decimal, such as octal
+# 010 or the string +.5; fast mode leaves them as strings so they are rejected
+_NON_DECIMAL_RE = re.compile(r"[-+]?0[0-9]|[-+]\.")
 
-        Returns:
-            Dict[str, FeatureFlag]: Dictionary of feature flags.
 
-        Raises:
-            ValueError: If the YAML file contains invalid feature flag configuration.
-            yaml.YAMLError: If the YAML file is invalid.
-        """
-        if not Path(self._file_path).exists():
-            return {}
+def _coerce_null(value: Any) -> Any:
+    """Convert a YAML null spelling loaded by the base loader to None.
+
+    Args:
+        value: Value as loaded by the base loader.
+
+    Returns:
+        Any: None if the value spells null, otherwise the value unchanged.
+    """
+    if isinstance(value, str) and value in _FAST_NULLS:
+        return None
+    return value
+
+
+def _coerce_value(value: Any) -> Any:
+    """Convert a flag value loaded by the base loader to a bool or number.
+
+    Args:
+        value: Value as loaded by the base loader.
+
+    Returns:
+        Any: The bool, number or None the string spells as SafeLoader would
+        read it, or the value unchanged if it spells none of them.
+    """
+    if not isinstance(value, str):
+        return value
+    if value in _FAST_NULLS:
+        return None
+    boolean = _FAST_BOOLEANS.get(value)
+    if boolean is not None:
+        return boolean
+    if _FAST_NUMBER_RE.fullmatch(value) and not _NON_DECIMAL_RE.match(value):
+        return float(value) if "." in value else int(value)
+    return value
+
+
+def _load_events(content: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+    """Load a flat YAML document from the base loader's parser events.
+
+    Flag files are mostly a mapping of names to mappings of scalars. Building
+    those straight from the events gives what the base loader would return
+    without composing a node graph and running the constructor over it.
+
+    Args:
+        content: YAML document, as text or bytes.
+
+    Returns:
+        Optional[Dict[str, Any]]: The document, or None if it is not such a
+        mapping or uses aliases, so the base loader has to load it.
+
+    Raises:
+        yaml.YAMLError: If the document is invalid.
+    """
+    events = yaml.parse(content, Loader=_BaseLoader)
+    next(events)  # StreamStartEvent
+    if (
+        type(next(events)) is not DocumentStartEvent
+        or type(next(events)) is not MappingStartEvent
+    ):
+        return None
+
+    data: Dict[str, Any] = {}
+    event = next(events)
+    while type(event) is ScalarEvent:
+        name = event.value
+        event = next(events)
+        if type(event) is ScalarEvent:
+            data[name] = event.value
+        elif type(event) is MappingStartEvent:
+            config = {}
+            event = next(events)
+            while type(event) is ScalarEvent:
+                value = next(events)
+                if type(value) is not ScalarEvent:
+                    return None
+                config[event.value] = value.value
+                event = next(events)
+            if type(event) is not MappingEndEvent:
+                return None
+            data[name] = config
+        else:
+            return None
+        event = next(events)
+
+    # Complex keys, or more documents after this one, are left to the loader
+    if (
+        type(event) is not MappingEndEvent
+        or type(next(events)) is not DocumentEndEvent
+        or type(next(events)) is not StreamEndEvent
+    ):
+        return None
+    return data
+
+
+def _merge_documents(documents: Iterable[Any]) -> Dict[str, Any]:
+    """Merge the mappings of several YAML documents, later ones winning.
+
+    Args:
+        documents: Parsed documents in file order.
+
+    Returns:
+        Dict[str, Any]: The merged mapping; documents that are not mappings
+        are skipped.
+    """
+    data: Dict[str, Any] = {}
+    for document in documents:
+        if isinstance(document, dict):
+            data.update(document)
+    return data
+
+
+def _parse_chunk(chunk: bytes, loader: Any = _SafeLoader) -> Dict[str, Any]:
+    """Parse the YAML documents in one piece of a file.
+
+    Runs in worker processes in parallel mode, so it lives at module level
+    where it can be pickled.
+
+    Args:
+        chunk: Raw YAML, usually a single document.
+        loader: PyYAML loader class to parse with.
+
+    Returns:
+        Dict[str, Any]: The merged mappings of the chunk's documents.
 
-        try:
-            with open(self._file_path) as f:
-                data = yaml.safe_load(f)
-        except yaml.YAMLError as err:
-            raise yaml.YAMLError(f"Invalid YAML file: {err!s}") from err
+    Raises:
+        yaml.YAMLError: If the chunk is invalid.
+    """
+    try:
+        # The loader detects the encoding of bytes input itself
+        return _merge_documents(yaml.load_all(chunk, Loader=loader))
+    except yaml.YAMLError as err:
+        # Marked errors don't survive pickling, so send back a plain one
+        raise yaml.YAMLError(str(err)) from None
 
-        if not data or not isinstance(data, dict):
-            return {}
 
-        # Extract common description if present
-        common_description = None
-        if "description" in data:
-            common_description = data.pop("description")
+def _parse_documents(
+    content: Union[str, bytes], loader: Any, min_size: int
+) -> Dict[str, Any]:
+    """Parse all documents of a YAML file, merging their mappings in order.
 
-        flags: Dict[str, FeatureFlag] = {}
-        for name, config in data.items():
-            if not isinstance(config, dict):
-                continue
+    Bytes content of at least min_size bytes is split at its "---" lines and
+    the pieces are parsed in worker processes.
 
-            # Skip entries that are used for YAML anchors
-            if name.startswith("common_"):
-                continue
+    Args:
+        content: YAML file, as text or bytes.
+        loader: PyYAML loader class to parse with.
+        min_size: Smallest content size in bytes parsed in worker processes.
+
+    Returns:
+        Dict[str, Any]: The merged mappings of all documents.
+
+    Raises:
+        yaml.YAMLError: If a document is invalid.
+    """
+    if isinstance(content, bytes) and len(content) >= min_size:
+        chunks = _DOCUMENT_SEPARATOR.split(content)
+        if len(chunks) > 1:
+            # Imported here so users of the in-process path don't pay for
+            # loading multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
 
             try:
-                # Get flag configuration with defaults
-                flag_type = config.get("type")
-                value = config.get("value")
-                description = config.get("description", common_description)
-
-                # Validate required fields
-                if flag_type is None:
-                    raise ValueError("Missing 'type' for feature flag")
-                if value is None:
-                    raise ValueError("Missing required field 'value'")
-
-                # Validate value based on type
-                if flag_type == "boolean":
-                    if not isinstance(value, bool):
-                        raise ValueError("Boolean flag must have a boolean value")
-                elif flag_type == "percentage":
-                    if not isinstance(value, (int, float)):
-                        raise ValueError("Percentage flag must have a numeric value")
-                    if not 0 <= value <= MAX_PERCENTAGE:
-                        raise ValueError(
-                            f"Percentage value must be between 0 and {MAX_PERCENTAGE}"
-                        )
-                elif flag_type == "per_thousand":
-                    if not isinstance(value, (int, float)):
-                        raise ValueError("Per-thousand flag must have a numeric value")
-                    if not 0 <= value <= MAX_PER_THOUSAND:
-                        raise ValueError(
-                            f"Per-thousand value must be between 0 and {MAX_PER_THOUSAND}"
-                        )
-                else:
-                    raise ValueError(f"Invalid flag type: {flag_type}")
-
-                flags[name] = FeatureFlag(name, flag_type, value, description)
-            except ValueError as err:
-                raise ValueError(
-                    f"Invalid configuration for feature flag '{name}': {err!s}"
-                ) from err
-
-        return flags
+                with ProcessPoolExecutor() as pool:
+                    parse = partial(_parse_chunk, loader=loader)
+                    return _merge_documents(pool.map(parse, chunks))
+            except yaml.YAMLError:
+                # The split can separate a document from its directives, so
+                # fall through and let the whole file decide the result
+                pass
+
+    return _merge_documents(yaml.load_all(content, Loader=loader))
+
+
+def _parse_flags(
+    content: Union[str, bytes],
+    parallel: bool = False,
+    fast: bool = False,
+    min_size: int = PARALLEL_MIN_SIZE,
+) -> Mapping[str, FeatureFlag]:
+    """Parse a YAML document into feature flags.
+
+    Args:
+        content: YAML document, as text or bytes.
+        parallel: Merge the mappings of all documents in the content, parsing
+            them in worker processes once bytes content reaches min_size.
+        fast: Load with the base loader, which resolves no tags or merge keys,
+            and convert flag values from strings.
+        min_size: Smallest content size in bytes parsed in worker processes.
+
+    Returns:
+        Mapping[str, FeatureFlag]: Read-only mapping of feature flags.
+    """
+    loader = _BaseLoader if fast else _SafeLoader
+    try:
+        if parallel:
+            data = _parse_documents(content, loader, min_size)
+        else:
+            # Fast mode streams flat documents from the parser events
+            data = _load_events(content) if fast else None
+            if data is None:
+                # The loader detects the encoding of bytes input itself
+                data = yaml.load(content, Loader=loader)
+    except yaml.YAMLError as err:
+        raise yaml.YAMLError(f"Invalid YAML file: {err!s}") from err
+
+    # Results are cached and shared, so hand out read-only views
+    if not data or not isinstance(data, dict):
+        return NO_FLAGS
+
+    # Extract common description if present; it applies to every flag while
+    # they are built below, so the entries are only walked once
+    common_description = data.pop("description", None)
+
+    # Entries starting with "common_" only hold YAML anchors. Interned names make
+    # the manager's flag lookups compare by identity
+    flags = (
+        _build_flag(sys.intern(name), config, common_description, fast)
+        for name, config in data.items()
+        if isinstance(config, dict) and not name.startswith("common_")
+    )
+    return MappingProxyType({flag.name: flag for flag in flags})
+
+
+def _build_flag(
+    name: str,
+    config: Dict[str, Any],
+    common_description: Optional[str],
+    fast: bool = False,
+) -> FeatureFlag:
+    """Build a feature flag from its YAML configuration.
+
+    Args:
+        name: Flag name.
+        config: Flag configuration with "type", "value" and optional "description".
+        common_description: Description used when the flag has none.
+        fast: The config was loaded by the base loader, so its value is still
+            a string.
+
+    Returns:
+        FeatureFlag: The feature flag.
+
+    Raises:
+        ValueError: If the configuration is invalid.
+    """
+    try:
+        # Get flag configuration with defaults
+        flag_type = config.get("type")
+        value = config.get("value")
+        description = config.get("description", common_description)
+        if fast:
+            flag_type = _coerce_null(flag_type)
+            value = _coerce_value(value)
+            description = _coerce_null(description)
+        if isinstance(description, str):
+            # Flags often share descriptions, so keep a single copy of each
+            description = sys.intern(description)
+
+        # Validate required fields
+        if flag_type is None:
+            raise ValueError("Missing 'type' for feature flag")
+        if value is None:
+            raise ValueError("Missing required field 'value'")
+
+        # FeatureFlag validates the type and value
+        return FeatureFlag(name, flag_type, value, description)
+    except ValueError as err:
+        raise ValueError(
+            f"Invalid configuration for feature flag '{name}': {err!s}"
+        ) from err
+
+
+class YamlSource(FileSource):
+    """Feature flag source that reads from a YAML file.
+
+    get_flags() raises yaml.YAMLError if the document is not valid YAML.
+    """
+
+    _parse = staticmethod(_parse_flags)
+
+    def __init__(
+        self,
+        file_path: Union[str, "os.PathLike[str]", None] = None,
+        parallel: bool = False,
+        min_size: int = PARALLEL_MIN_SIZE,
+        fast: bool = False,
+        *,
+        content: Optional[Union[str, bytes]] = None,
+    ):
+        """Initialize the YAML source.
+
+        Args:
+            file_path: Path to the YAML file containing feature flags, as a
+                string or path-like object.
+            parallel: Merge the documents of files split into several YAML
+                documents in file order, parsing large files in worker
+                processes.
+            min_size: Smallest file size in bytes parsed in worker processes.
+            fast: Load with the base loader, which skips tag resolution and
+                merge keys, and convert flag values from strings. Anchors and
+                aliases still work, "<<" merge keys do not, and quoted values
+                are converted like plain ones.
+            content: In-memory YAML document to parse instead of a file, as
+                given to from_string().
+
+        Raises:
+            ValueError: If both or neither of file_path and content are given.
+        """
+        super().__init__(file_path, content=content)
+        # In the order _parse_flags takes them
+        self._options = (parallel, fast, min_size)
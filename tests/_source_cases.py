@@ -0,0 +1,85 @@
+"""
+Flag payloads shared by the file-based source tests.
+
+Each payload is a plain dict, serialized to JSON or YAML by the test using it.
+"""
+
+# Constants for percentage and per-thousand values
+MAX_PERCENTAGE = 100
+MAX_PER_THOUSAND = 1000
+
+# One flag of each type, loaded by the valid-configuration tests
+VALID_CONFIG = {
+    "feature1": {
+        "type": "boolean",
+        "value": True,
+        "description": "Test flag 1",
+    },
+    "feature2": {
+        "type": "percentage",
+        "value": MAX_PERCENTAGE / 2,
+        "description": "Test flag 2",
+    },
+    "feature3": {
+        "type": "per_thousand",
+        "value": MAX_PER_THOUSAND / 2,
+        "description": "Test flag 3",
+    },
+}
+
+# (payload, {flag name: expected value}) pairs that load successfully
+VALID_CASES = [
+    ({"feature1": {"type": "boolean", "value": True}}, {"feature1": True}),
+    ({"feature1": {"type": "boolean", "value": False}}, {"feature1": False}),
+    ({"feature1": {"type": "percentage", "value": 0}}, {"feature1": 0}),
+    (
+        {"feature1": {"type": "percentage", "value": MAX_PERCENTAGE}},
+        {"feature1": MAX_PERCENTAGE},
+    ),
+    (
+        {"feature1": {"type": "per_thousand", "value": MAX_PER_THOUSAND / 2}},
+        {"feature1": MAX_PER_THOUSAND / 2},
+    ),
+    (
+        {"feature1": {"type": "boolean", "value": True}, "not_a_flag": "ignored"},
+        {"feature1": True},
+    ),
+]
+
+# (payload, expected error message fragment) pairs that fail to load
+INVALID_CASES = [
+    ({"feature1": {"value": True}}, "Missing 'type' for feature flag"),
+    ({"feature1": {"type": "boolean"}}, "feature1"),
+    ({"feature1": {"type": "unknown", "value": True}}, "Invalid flag type"),
+    (
+        {"feature1": {"type": "boolean", "value": "yes"}},
+        "Boolean flag must have a boolean value",
+    ),
+    (
+        {"feature1": {"type": "percentage", "value": "50"}},
+        "Percentage flag must have a numeric value",
+    ),
+    (
+        {"feature1": {"type": "percentage", "value": MAX_PERCENTAGE + 1}},
+        "Percentage value must be between 0 and 100",
+    ),
+    (
+        {"feature1": {"type": "per_thousand", "value": -1}},
+        "Per-thousand value must be between 0 and 1000",
+    ),
+    (
+        {
+            "feature1": {"type": "boolean", "value": True},
+            "feature2": {"type": "percentage", "value": MAX_PERCENTAGE * 2},
+        },
+        "feature2",
+    ),
+]
+
+# Fast YAML loading converts string values such as "yes" and "50", so it only
+# shares the cases whose values are not strings
+FAST_INVALID_CASES = [
+    (payload, message)
+    for payload, message in INVALID_CASES
+    if not any(isinstance(config.get("value"), str) for config in payload.values())
+]
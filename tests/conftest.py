@@ -0,0 +1,36 @@
+"""
+Shared fixtures for feature flag source tests.
+"""
+
+from pathlib import Path
+from typing import Mapping
+
+import pytest
+
+from aflags.core import FeatureFlag
+from aflags.sources.json import JsonSource
+from aflags.sources.yaml import YamlSource
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir() -> Path:
+    """Directory holding the fixture files."""
+    return Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def valid_json_flags(fixtures_dir: Path) -> Mapping[str, FeatureFlag]:
+    """Flags parsed once from fixtures/valid_flags.json.
+
+    Sources return read-only mappings, so tests can share them safely.
+    """
+    return JsonSource(fixtures_dir / "valid_flags.json").get_flags()
+
+
+@pytest.fixture(scope="session")
+def valid_yaml_flags(fixtures_dir: Path) -> Mapping[str, FeatureFlag]:
+    """Flags parsed once from fixtures/valid_flags.yaml.
+
+    Sources return read-only mappings, so tests can share them safely.
+    """
+    return YamlSource(fixtures_dir / "valid_flags.yaml").get_flags()
@@ -2,6 +2,15 @@
 Tests for core feature flag functionality.
 """
 
+import asyncio
+import hashlib
+import os
+import random
+import subprocess
+import sys
+import zlib
+from types import MappingProxyType
+
 import pytest
 
 from aflags.core import FeatureFlag, FeatureFlagManager, FeatureFlagSource, FlagType
@@ -56,6 +65,77 @@ def test_per_thousand_flag():
     assert flag.description == "Test flag"
 
 
+def test_flag_has_no_instance_dict():
+    """Test that feature flags use slots instead of a per-instance dict."""
+    flag = FeatureFlag(name="test_flag", type=FlagType.BOOLEAN, value=True)
+
+    assert not hasattr(flag, "__dict__")
+    with pytest.raises(AttributeError):
+        flag.unknown = True  # type: ignore
+
+
+def test_boolean_flag_skips_hash_setup():
+    """Test that boolean flags do not load hashing or random helpers."""
+    flag = FeatureFlag(name="test_flag", type=FlagType.BOOLEAN, value=True)
+    assert flag._hasher is None
+    assert flag._random is None
+
+    flag = FeatureFlag(name="test_flag", type=FlagType.PERCENTAGE, value=50)
+    assert callable(flag._hasher)
+    assert callable(flag._random)
+
+
+def test_fractional_value_threshold():
+    """Test that fractional values enable every bucket below the value."""
+    flag = FeatureFlag(name="test_flag", type=FlagType.PER_THOUSAND, value=750.5)
+    assert flag._value_int == 751
+    assert all((bucket < flag._value_int) == (bucket < 750.5) for bucket in range(1000))
+
+
+def test_unchecked_flag_matches_validated_flag():
+    """Test that the unchecked constructor prepares the same flag."""
+    flag = FeatureFlag(name="test_flag", type=FlagType.PER_THOUSAND, value=250)
+    unchecked = FeatureFlag._unchecked("test_flag", FlagType.PER_THOUSAND, 250)
+
+    assert unchecked.hash_algo == flag.hash_algo
+    assert unchecked._max_value == flag._max_value
+    assert unchecked._threshold_float == flag._threshold_float
+    for i in range(100):
+        user_id = f"user_{i}"
+        assert unchecked.is_enabled(user_id) == flag.is_enabled(user_id)
+
+
+def test_flag_assignment_recomputes_thresholds():
+    """Test that assigning flag fields updates the precomputed state."""
+    flag = FeatureFlag(name="test_flag", type=FlagType.PERCENTAGE, value=100)
+    flag.value = 0
+    assert not any(flag.is_enabled(f"user_{i}") for i in range(1000))
+
+    flag.type = "per_thousand"
+    flag.value = 1000
+    assert flag.type is FlagType.PER_THOUSAND
+    assert all(flag.is_enabled(f"user_{i}") for i in range(1000))
+
+    expected = FeatureFlag(name="other", type=FlagType.PER_THOUSAND, value=500)
+    flag.value = 500
+    flag.name = "other"
+    flag.hash_algo = "crc32"
+    expected.hash_algo = "crc32"
+    for i in range(100):
+        user_id = f"user_{i}"
+        assert flag.is_enabled(user_id) == expected.is_enabled(user_id)
+
+    flag.type = FlagType.BOOLEAN
+    flag.value = False
+    assert not flag.is_enabled()
+
+    with pytest.raises(ValueError, match="Invalid flag type"):
+        flag.type = "invalid"
+    with pytest.raises(ValueError, match="Invalid hash algorithm"):
+        flag.hash_algo = "md5"
+    assert flag.hash_algo == "crc32"
+
+
 def test_anonymous_user():
     """Test feature flag evaluation for anonymous user."""
     flag = FeatureFlag(name="test_flag", type=FlagType.BOOLEAN, value=True)
@@ -78,17 +158,143 @@ def test_consistent_user_assignment():
     assert result1 == result2
 
     # Different users should get different results
-    other_user = "other_user"
-    result3 = flag.is_enabled(user_id=other_user)
-    assert result1 != result3
+    results = {flag.is_enabled(user_id=f"user_{i}") for i in range(100)}
+    assert results == {True, False}
+
+
+@pytest.mark.parametrize("hash_algo", ["crc32", "mmh3", "sha256", "sha256-legacy"])
+def test_hash_algo_assignment(hash_algo):
+    """Test consistent user assignment with each hash algorithm."""
+    flag = FeatureFlag(
+        name="test_flag",
+        type=FlagType.PERCENTAGE,
+        value=MAX_PERCENTAGE / 2,
+        hash_algo=hash_algo,
+    )
+
+    assert flag.hash_algo == hash_algo
+    assert flag.is_enabled(user_id="test_user") == flag.is_enabled(user_id="test_user")
+    results = {flag.is_enabled(user_id=f"user_{i}") for i in range(100)}
+    assert results == {True, False}
+
+
+def test_integer_user_id():
+    """Test that non-string user IDs are bucketed like their string form."""
+    flag = FeatureFlag(name="test_flag", type=FlagType.PERCENTAGE, value=50)
+    assert all(flag.is_enabled(i) == flag.is_enabled(str(i)) for i in range(200))
+
+    class MockSource(FeatureFlagSource):
+        def get_flags(self):
+            return {"test_flag": flag}
+
+    manager = FeatureFlagManager(MockSource())
+    assert manager.is_enabled("test_flag", 123) == flag.is_enabled("123")
+
+
+def test_hash_values_are_stable():
+    """Test that each algorithm hashes "name:user_id" as documented."""
+    mmh3 = pytest.importorskip("mmh3")
+    expected = {
+        "crc32": zlib.crc32(b"test_flag:test_user"),
+        "mmh3": mmh3.hash128(b"test_flag:test_user", signed=False),
+        "sha256": int.from_bytes(
+            hashlib.sha256(b"test_flag:test_user").digest()[:8], byteorder="big"
+        ),
+    }
+    for hash_algo, value in expected.items():
+        flag = FeatureFlag(
+            name="test_flag", type=FlagType.PERCENTAGE, value=50, hash_algo=hash_algo
+        )
+        assert flag._hash("test_user") == value
+
+
+@pytest.mark.parametrize("flag_type", [FlagType.PERCENTAGE, FlagType.PER_THOUSAND])
+def test_legacy_hash_keeps_old_assignments(flag_type):
+    """Test that sha256-legacy buckets users exactly like aflags 0.1.0."""
+    flag = FeatureFlag(
+        name="test_flag", type=flag_type, value=30, hash_algo="sha256-legacy"
+    )
+    max_value = flag._max_value
+
+    class MockSource(FeatureFlagSource):
+        def get_flags(self):
+            return {"test_flag": flag}
+
+    manager = FeatureFlagManager(MockSource())
+    for i in range(200):
+        user_id = f"user_{i}"
+        digest = hashlib.sha256(f"test_flag:{user_id}".encode()).digest()
+        seed = int.from_bytes(digest[:8], byteorder="big")
+        expected = random.Random(seed).randint(0, max_value - 1) < 30
+        assert flag.is_enabled(user_id) is expected
+        assert manager.is_enabled("test_flag", user_id) is expected
+
+
+def test_invalid_hash_algo():
+    """Test error handling for an unknown hash algorithm."""
+    with pytest.raises(ValueError) as exc_info:
+        FeatureFlag(
+            name="test_flag",
+            type=FlagType.PERCENTAGE,
+            value=MAX_PERCENTAGE / 2,
+            hash_algo="md5",  # type: ignore
+        )
+    assert "Invalid hash algorithm" in str(exc_info.value)
+
+
+def test_unchecked_flag_rejects_unknown_hash_algo():
+    """Test that flags skipping validation cannot fall back to another hash."""
+    with pytest.raises(ValueError) as exc_info:
+        FeatureFlag._unchecked(
+            "test_flag", FlagType.PERCENTAGE, MAX_PERCENTAGE / 2, hash_algo="md5"
+        )
+    assert "Invalid hash algorithm" in str(exc_info.value)
+
+
+def test_invalid_default_hash_algo():
+    """Test that an unknown AFLAGS_HASH fails at import."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import aflags.core"],
+        env={**os.environ, "AFLAGS_HASH": "md5"},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode != 0
+    assert "Invalid hash algorithm 'md5' in AFLAGS_HASH" in result.stderr
+
+
+@pytest.mark.parametrize(
+    "flag_type,value",
+    [
+        (FlagType.BOOLEAN, True),
+        (FlagType.BOOLEAN, False),
+        (FlagType.PERCENTAGE, MAX_PERCENTAGE / 3),
+        (FlagType.PER_THOUSAND, 750.5),
+    ],
+)
+@pytest.mark.parametrize("hash_algo", ["crc32", "mmh3", "sha256", "sha256-legacy"])
+def test_is_enabled_batch(flag_type, value, hash_algo):
+    """Test that batch evaluation matches per-user evaluation."""
+    np = pytest.importorskip("numpy")
+    flag = FeatureFlag(
+        name="test_flag", type=flag_type, value=value, hash_algo=hash_algo
+    )
+
+    user_ids = [f"user_{i}" for i in range(500)]
+    results = flag.is_enabled_batch(user_ids)
 
+    assert results.dtype == np.bool_
+    assert results.tolist() == [flag.is_enabled(user_id=u) for u in user_ids]
 
-def test_invalid_flag_type():
+
+@pytest.mark.parametrize("flag_type", ["invalid_type", ["boolean"], None])
+def test_invalid_flag_type(flag_type):
     """Test error handling for invalid flag type."""
     with pytest.raises(ValueError) as exc_info:
         FeatureFlag(
             name="test_flag",
-            type="invalid_type",  # type: ignore
+            type=flag_type,  # type: ignore
             value=True,
         )
     assert "Invalid flag type" in str(exc_info.value)
@@ -168,6 +374,28 @@ def test_feature_flag_manager():
     assert manager.is_enabled("nonexistent_flag", user_id="test_user") is False
 
 
+def test_source_get_flags_async():
+    """Test that get_flags_async returns the result of get_flags."""
+
+    class MockSource(FeatureFlagSource):
+        def __init__(self):
+            self.flags = {
+                "test_flag": FeatureFlag(
+                    name="test_flag", type=FlagType.BOOLEAN, value=True
+                )
+            }
+
+        def get_flags(self):
+            return self.flags
+
+    async def load_all(sources):
+        return await asyncio.gather(*(source.get_flags_async() for source in sources))
+
+    sources = [MockSource(), MockSource()]
+    results = asyncio.run(load_all(sources))
+    assert results == [source.flags for source in sources]
+
+
 def test_feature_flag_manager_reload():
     """Test feature flag manager reload functionality."""
 
@@ -192,6 +420,159 @@ def test_feature_flag_manager_reload():
     assert manager.is_enabled("test_flag") is False
 
 
+def test_feature_flag_manager_boolean_flag_after_reload():
+    """Test that boolean flags answer every user alike after a reload."""
+
+    class MockSource(FeatureFlagSource):
+        def __init__(self):
+            self.value = False
+
+        def get_flags(self):
+            return {
+                "test_flag": FeatureFlag(
+                    name="test_flag", type=FlagType.BOOLEAN, value=self.value
+                )
+            }
+
+    source = MockSource()
+    manager = FeatureFlagManager(source)
+    source.value = True
+    manager.reload()
+    assert manager.is_enabled("test_flag") is True
+    assert all(
+        manager.is_enabled("test_flag", user_id=f"user_{i}") is True for i in range(100)
+    )
+
+
+def test_feature_flag_manager_reload_keeps_flags_while_loading():
+    """Test that flags stay available while the source is being reloaded."""
+
+    class MockSource(FeatureFlagSource):
+        def __init__(self):
+            self.manager = None
+            self.seen_during_reload = None
+
+        def get_flags(self):
+            if self.manager is not None:
+                self.seen_during_reload = self.manager.is_enabled("test_flag")
+            return {
+                "test_flag": FeatureFlag(
+                    name="test_flag", type=FlagType.BOOLEAN, value=True
+                )
+            }
+
+    source = MockSource()
+    manager = FeatureFlagManager(source)
+    source.manager = manager
+    manager.reload()
+    assert source.seen_during_reload is True
+
+
+def test_feature_flag_manager_decision_cache():
+    """Test that memoized user decisions are dropped on reload."""
+
+    class MockSource(FeatureFlagSource):
+        def __init__(self):
+            self.value = MAX_PERCENTAGE
+
+        def get_flags(self):
+            return {
+                "test_flag": FeatureFlag(
+                    name="test_flag", type=FlagType.PERCENTAGE, value=self.value
+                )
+            }
+
+    source = MockSource()
+    manager = FeatureFlagManager(source)
+    assert manager.is_enabled("test_flag", user_id="test_user") is True
+    assert manager._state.decisions == {("test_flag", "test_user"): True}
+
+    # Anonymous checks are never memoized
+    manager.is_enabled("test_flag")
+    assert len(manager._state.decisions) == 1
+
+    source.value = 0
+    manager.reload()
+    assert manager._state.decisions == {}
+    assert manager.is_enabled("test_flag", user_id="test_user") is False
+
+
+def test_feature_flag_manager_reload_unchanged_source():
+    """Test that reloading unchanged flags keeps memoized decisions."""
+    flags = MappingProxyType(
+        {
+            "test_flag": FeatureFlag(
+                name="test_flag", type=FlagType.PERCENTAGE, value=MAX_PERCENTAGE
+            )
+        }
+    )
+
+    class MockSource(FeatureFlagSource):
+        def get_flags(self):
+            return flags
+
+    manager = FeatureFlagManager(MockSource())
+    assert manager.is_enabled("test_flag", user_id="test_user") is True
+    manager.reload()
+    assert manager._state.decisions == {("test_flag", "test_user"): True}
+
+
+def test_feature_flag_manager_reload_source_updated_in_place():
+    """Test that a source returning the same dict updated in place is reloaded."""
+
+    class MockSource(FeatureFlagSource):
+        def __init__(self):
+            self.flags = {
+                "test_flag": FeatureFlag(
+                    name="test_flag", type=FlagType.BOOLEAN, value=True
+                )
+            }
+
+        def get_flags(self):
+            return self.flags
+
+    source = MockSource()
+    manager = FeatureFlagManager(source)
+    assert manager.is_enabled("test_flag") is True
+
+    source.flags["test_flag"] = FeatureFlag(
+        name="test_flag", type=FlagType.BOOLEAN, value=False
+    )
+    manager.reload()
+    assert manager.is_enabled("test_flag") is False
+
+
+def test_feature_flag_manager_is_enabled_all():
+    """Test that checking all flags at once matches per-flag checks."""
+    pytest.importorskip("numpy")
+
+    class MockSource(FeatureFlagSource):
+        def get_flags(self):
+            return {
+                "on": FeatureFlag(name="on", type=FlagType.BOOLEAN, value=True),
+                "off": FeatureFlag(name="off", type=FlagType.BOOLEAN, value=False),
+                "half": FeatureFlag(
+                    name="half", type=FlagType.PERCENTAGE, value=MAX_PERCENTAGE / 2
+                ),
+                "rare": FeatureFlag(
+                    name="rare",
+                    type=FlagType.PER_THOUSAND,
+                    value=150.5,
+                    hash_algo="sha256",
+                ),
+            }
+
+    manager = FeatureFlagManager(MockSource())
+    for i in range(200):
+        user_id = f"user_{i}"
+        expected = {
+            name: manager.is_enabled(name, user_id) for name in manager._state.flags
+        }
+        assert manager.is_enabled_all(user_id) == expected
+
+    assert set(manager.is_enabled_all()) == {"on", "off", "half", "rare"}
+
+
 def test_feature_flag_manager_constructors():
     """Test semantic constructors for feature flag manager."""
     # Test JSON constructor
@@ -84,9 +84,28 @@ def test_invalid_per_thousand_value():
         assert "Per-thousand value must be between 0 and 1000" in str(exc_info.value)
 
 
-def test_invalid_value():
+def test_negative_per_thousand_value():
+    """Test error handling for a negative per-thousand value."""
+    with patch.dict(os.environ, {"AFLAG_FEATURE1": "-5"}):
+        source = EnvSource()
+        with pytest.raises(ValueError) as exc_info:
+            source.get_flags()
+        assert "Per-thousand value must be between 0 and 1000" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("value, expected", [("5.", 5.0), (".5", 0.5), ("-0", 0.0)])
+def test_number_spellings(value, expected):
+    """Test the decimal spellings read as per-thousand values."""
+    with patch.dict(os.environ, {"AFLAG_FEATURE1": value}):
+        flags = EnvSource().get_flags()
+        assert flags["feature1"].type.value == "per_thousand"
+        assert flags["feature1"].value == expected
+
+
+@pytest.mark.parametrize("value", ["invalid", "1.2.3", "1e3", "nan", "+5", "+.5"])
+def test_invalid_value(value):
     """Test error handling for invalid value."""
-    env_vars = {"AFLAG_FEATURE1": "invalid"}
+    env_vars = {"AFLAG_FEATURE1": value}
 
     with patch.dict(os.environ, env_vars):
         source = EnvSource()
@@ -129,3 +148,23 @@ def test_no_flags():
         source = EnvSource()
         flags = source.get_flags()
         assert len(flags) == 0
+
+
+def test_cached_flags():
+    """Test that flags are only re-parsed when prefixed variables change."""
+    with patch.dict(os.environ, {"AFLAG_FEATURE1": "true"}):
+        source = EnvSource()
+        flags = source.get_flags()
+        assert source.get_flags() is flags
+
+        # The cached flags are shared, so callers cannot modify them
+        with pytest.raises(TypeError):
+            flags["feature2"] = flags["feature1"]  # type: ignore
+
+        with patch.dict(os.environ, {"AFLAG_FEATURE1": "false"}):
+            reloaded = source.get_flags()
+            assert reloaded is not flags
+            assert reloaded["feature1"].value is False
+
+        with patch.dict(os.environ, {"UNRELATED_VARIABLE": "1"}):
+            assert source.get_flags()["feature1"].value is True
@@ -0,0 +1,204 @@
+"""
+Tests shared by the JSON and YAML file-based feature flag sources.
+"""
+
+import json
+import os
+from functools import partial
+from types import MappingProxyType
+
+import pytest
+import yaml
+from _source_cases import (
+    FAST_INVALID_CASES,
+    INVALID_CASES,
+    VALID_CASES,
+    VALID_CONFIG,
+)
+
+from aflags.sources._files import read_file
+from aflags.sources.json import JsonSource
+from aflags.sources.yaml import YamlSource
+
+# (in-memory source factory, serializer) for every file-based source
+SOURCES = [
+    pytest.param(JsonSource.from_string, json.dumps, id="json"),
+    pytest.param(YamlSource.from_string, yaml.dump, id="yaml"),
+    pytest.param(partial(YamlSource.from_string, fast=True), yaml.dump, id="yaml-fast"),
+]
+
+# Sources that keep the types of quoted values
+STRICT_SOURCES = SOURCES[:2]
+
+# (file source class, serializer, file suffix) for every file-based source
+FILE_SOURCES = [
+    pytest.param(JsonSource, json.dumps, ".json", id="json"),
+    pytest.param(YamlSource, yaml.dump, ".yaml", id="yaml"),
+]
+
+
+@pytest.mark.parametrize("make_source, dump", SOURCES)
+@pytest.mark.parametrize("payload, expected", VALID_CASES)
+def test_valid_payload(make_source, dump, payload, expected):
+    """Test that both sources load the same flags from the same payload."""
+    flags = make_source(dump(payload)).get_flags()
+    assert {name: flag.value for name, flag in flags.items()} == expected
+
+
+@pytest.mark.parametrize("make_source, dump", STRICT_SOURCES)
+@pytest.mark.parametrize("payload, message", INVALID_CASES)
+def test_invalid_payload(make_source, dump, payload, message):
+    """Test that both sources reject the same payload with the same error."""
+    source = make_source(dump(payload))
+    with pytest.raises(ValueError) as exc_info:
+        source.get_flags()
+    assert message in str(exc_info.value)
+
+
+@pytest.mark.parametrize("payload, message", FAST_INVALID_CASES)
+def test_invalid_payload_fast_yaml(payload, message):
+    """Test that fast YAML loading rejects the payloads it reads unconverted."""
+    source = YamlSource.from_string(yaml.dump(payload), fast=True)
+    with pytest.raises(ValueError) as exc_info:
+        source.get_flags()
+    assert message in str(exc_info.value)
+
+
+def test_read_file_keeps_raw_bytes(tmp_path):
+    """Test that files are read as bytes, without line ending translation."""
+    content = b"feature1:\r\n  type: boolean\r\n\x1a  value: true\r\n"
+    path = tmp_path / "flags.yaml"
+    path.write_bytes(content)
+    assert read_file(str(path)) == content
+
+
+def test_read_file_short_reads(tmp_path, monkeypatch):
+    """Test that reads returning less than asked for do not truncate files."""
+    content = yaml.dump(VALID_CONFIG).encode()
+    path = tmp_path / "flags.yaml"
+    path.write_bytes(content)
+
+    read = os.read
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "read", lambda fd, size: read(fd, min(size, 33)))
+        data = read_file(str(path))
+    assert data == content
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/status"), reason="needs a procfs file"
+)
+def test_read_file_reported_size_zero():
+    """Test that files whose fstat size is 0 are still read in full."""
+    path = "/proc/self/status"
+    assert os.stat(path).st_size == 0
+    assert read_file(path).startswith(b"Name:")
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_missing_file_returns_shared_empty_mapping(source_class, dump, suffix):
+    """Test that a missing file yields the same read-only empty mapping."""
+    source = source_class(f"nonexistent{suffix}")
+    flags = source.get_flags()
+    assert isinstance(flags, MappingProxyType)
+    assert len(flags) == 0
+    assert source.get_flags() is flags
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_from_string_runs_subclass_init(source_class, dump, suffix):
+    """Test that from_string() builds sources through their constructor."""
+
+    class TaggedSource(source_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.tag = suffix
+
+    source = TaggedSource.from_string(dump({"feature1": VALID_CONFIG["feature1"]}))
+    assert source.tag == suffix
+    assert set(source.get_flags()) == {"feature1"}
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_file_path_or_content_required(source_class, dump, suffix):
+    """Test that sources need exactly one of a file path and content."""
+    with pytest.raises(ValueError):
+        source_class()
+    with pytest.raises(ValueError):
+        source_class(f"flags{suffix}", content=dump({}))
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_unchanged_file_is_not_reparsed(tmp_path, source_class, dump, suffix):
+    """Test that flags are reused until the file changes."""
+    path = tmp_path / f"flags{suffix}"
+    path.write_text(dump({"feature1": {"type": "boolean", "value": True}}))
+
+    source = source_class(str(path))
+    flags = source.get_flags()
+    assert source.get_flags() is flags
+    assert source_class(str(path)).get_flags() is flags
+
+    # The cached flags are shared, so callers cannot modify them
+    with pytest.raises(TypeError):
+        del flags["feature1"]  # type: ignore
+
+    path.write_text(dump({"feature1": {"type": "boolean", "value": False}}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = source.get_flags()
+    assert reloaded is not flags
+    assert reloaded["feature1"].value is False
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_force_reparses_unchanged_file(tmp_path, source_class, dump, suffix):
+    """Test that force=True parses the file even when its stat is unchanged."""
+    path = tmp_path / f"flags{suffix}"
+    path.write_text(
+        dump({"feature1": {"type": "boolean", "value": True, "description": "old"}})
+    )
+    stat = path.stat()
+
+    source = source_class(str(path))
+    flags = source.get_flags()
+
+    # Same size and timestamps, so only a forced load sees the edit
+    path.write_text(
+        dump({"feature1": {"type": "boolean", "value": True, "description": "new"}})
+    )
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert source.get_flags() is flags
+
+    reloaded = source.get_flags(force=True)
+    assert reloaded is not flags
+    assert reloaded["feature1"].description == "new"
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_force_keeps_other_files_cached(tmp_path, source_class, dump, suffix):
+    """Test that force=True only drops the cached parse of its own file."""
+    content = dump({"feature1": {"type": "boolean", "value": True}})
+    forced_path = tmp_path / f"forced{suffix}"
+    other_path = tmp_path / f"other{suffix}"
+    forced_path.write_text(content)
+    other_path.write_text(content)
+
+    forced = source_class(str(forced_path))
+    other = source_class(str(other_path))
+    forced_flags = forced.get_flags()
+    other_flags = other.get_flags()
+
+    assert forced.get_flags(force=True) is not forced_flags
+    assert other.get_flags() is other_flags
+
+
+@pytest.mark.parametrize("source_class, dump, suffix", FILE_SOURCES)
+def test_path_like_file_path(tmp_path, source_class, dump, suffix):
+    """Test that path-like file paths are accepted and stored as strings."""
+    path = tmp_path / f"flags{suffix}"
+    path.write_text(dump({"feature1": {"type": "boolean", "value": True}}))
+
+    source = source_class(path)
+    assert source._file_path == str(path)
+    assert source.get_flags() is source_class(str(path)).get_flags()
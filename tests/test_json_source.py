@@ -3,9 +3,9 @@ Tests for JSON file-based feature flag source.
 """
 
 import json
-from pathlib import Path
 
 import pytest
+from _source_cases import VALID_CONFIG
 
 from aflags.sources.json import JsonSource
 
@@ -13,12 +13,13 @@ from aflags.sources.json import JsonSource
 MAX_PERCENTAGE = 100
 MAX_PER_THOUSAND = 1000
 
+# Serialized once at import rather than in every test
+_VALID_JSON = json.dumps(VALID_CONFIG).encode()
 
-def test_valid_json_source(tmp_path):
+
+def test_valid_json_source(valid_json_flags):
     """Test loading feature flags from a valid JSON file."""
-    fixture_path = Path(__file__).parent / "fixtures" / "valid_flags.json"
-    source = JsonSource(str(fixture_path))
-    flags = source.get_flags()
+    flags = valid_json_flags
 
     assert len(flags) == 3
     assert flags["feature1"].type.value == "boolean"
@@ -29,27 +30,28 @@ def test_valid_json_source(tmp_path):
     assert flags["feature3"].value == 500
 
 
-def test_missing_type():
+def test_missing_type(fixtures_dir):
     """Test error handling for missing type field."""
-    fixture_path = Path(__file__).parent / "fixtures" / "missing_type.json"
+    fixture_path = fixtures_dir / "missing_type.json"
     source = JsonSource(str(fixture_path))
     with pytest.raises(ValueError) as exc_info:
         source.get_flags()
     assert "Missing 'type' for feature flag" in str(exc_info.value)
 
 
-def test_invalid_boolean_value():
+def test_invalid_boolean_value(fixtures_dir):
     """Test error handling for invalid boolean value."""
-    fixture_path = Path(__file__).parent / "fixtures" / "invalid_boolean.json"
+    fixture_path = fixtures_dir / "invalid_boolean.json"
     source = JsonSource(str(fixture_path))
     with pytest.raises(ValueError) as exc_info:
         source.get_flags()
     assert "Boolean flag must have a boolean value" in str(exc_info.value)
+    assert "'feature1'" in str(exc_info.value)
 
 
-def test_invalid_percentage_value():
+def test_invalid_percentage_value(fixtures_dir):
     """Test error handling for invalid percentage value."""
-    fixture_path = Path(__file__).parent / "fixtures" / "invalid_percentage.json"
+    fixture_path = fixtures_dir / "invalid_percentage.json"
     source = JsonSource(str(fixture_path))
     with pytest.raises(ValueError) as exc_info:
         source.get_flags()
@@ -63,9 +65,18 @@ def test_nonexistent_file():
     assert len(flags) == 0
 
 
-def test_invalid_json():
+def test_invalid_json(fixtures_dir):
     """Test error handling for invalid JSON data."""
-    fixture_path = Path(__file__).parent / "fixtures" / "invalid.json"
+    fixture_path = fixtures_dir / "invalid.json"
+    source = JsonSource(str(fixture_path))
+    with pytest.raises(json.JSONDecodeError):
+        source.get_flags()
+
+
+def test_invalid_json_with_stdlib_parser(monkeypatch, fixtures_dir):
+    """Test error handling for invalid JSON data without orjson."""
+    monkeypatch.setattr("aflags.sources.json._loads", json.loads)
+    fixture_path = fixtures_dir / "invalid.json"
     source = JsonSource(str(fixture_path))
     with pytest.raises(json.JSONDecodeError):
         source.get_flags()
@@ -73,28 +84,7 @@ def test_invalid_json():
 
 def test_valid_json():
     """Test valid JSON configuration."""
-    config = {
-        "feature1": {
-            "type": "boolean",
-            "value": True,
-            "description": "Test flag 1",
-        },
-        "feature2": {
-            "type": "percentage",
-            "value": MAX_PERCENTAGE / 2,
-            "description": "Test flag 2",
-        },
-        "feature3": {
-            "type": "per_thousand",
-            "value": MAX_PER_THOUSAND / 2,
-            "description": "Test flag 3",
-        },
-    }
-
-    with open("test_flags.json", "w") as f:
-        json.dump(config, f)
-
-    source = JsonSource("test_flags.json")
+    source = JsonSource.from_string(_VALID_JSON)
     flags = source.get_flags()
 
     assert len(flags) == 3
@@ -104,3 +94,39 @@ def test_valid_json():
     assert flags["feature2"].value == MAX_PERCENTAGE / 2
     assert flags["feature3"].type.value == "per_thousand"
     assert flags["feature3"].value == MAX_PER_THOUSAND / 2
+
+
+def test_from_string_bytes():
+    """Test parsing an in-memory JSON document given as bytes."""
+    content = json.dumps({"feature1": {"type": "boolean", "value": True}})
+    source = JsonSource.from_string(content.encode())
+    flags = source.get_flags()
+
+    assert flags["feature1"].value is True
+    assert source.get_flags() is flags
+    assert source.get_flags(force=True) is not flags
+
+
+def test_from_string_invalid_value():
+    """Test error handling for an invalid in-memory JSON document."""
+    content = json.dumps({"feature1": {"type": "percentage", "value": "50"}})
+    source = JsonSource.from_string(content)
+    with pytest.raises(ValueError) as exc_info:
+        source.get_flags()
+    assert "Percentage flag must have a numeric value" in str(exc_info.value)
+
+
+def test_shared_descriptions_are_interned(tmp_path):
+    """Test that equal descriptions are stored once."""
+    path = tmp_path / "flags.json"
+    path.write_text(
+        json.dumps(
+            {
+                "feature1": {"type": "boolean", "value": True, "description": "Beta"},
+                "feature2": {"type": "boolean", "value": False, "description": "Beta"},
+            }
+        )
+    )
+
+    flags = JsonSource(str(path)).get_flags()
+    assert flags["feature1"].description is flags["feature2"].description
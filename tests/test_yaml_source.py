@@ -2,37 +2,33 @@
 Tests for YAML file-based feature flag source.
 """
 
-import os
+import subprocess
+import sys
 
 import pytest
 import yaml
+from _source_cases import VALID_CONFIG
 
-from aflags.sources.yaml import YamlSource
+from aflags.sources.yaml import YamlSource, _load_events
 
 # Constants for percentage and per-thousand values
 MAX_PERCENTAGE = 100
 MAX_PER_THOUSAND = 1000
 
-
-def get_fixture_path(filename: str) -> str:
-    """Get the absolute path to a fixture file.
-
-    Args:
-        filename: Name of the fixture file.
-
-    Returns:
-        str: Absolute path to the fixture file.
-    """
-    return os.path.join(os.path.dirname(__file__), "fixtures", filename)
+# Serialized once at import rather than in every test
+_VALID_YAML = yaml.dump(VALID_CONFIG).encode()
+_COMMON_DESCRIPTION_YAML = yaml.dump(
+    {
+        "description": "Common description",
+        "feature1": {"type": "boolean", "value": True},
+        "feature2": {"type": "percentage", "value": MAX_PERCENTAGE / 2},
+    }
+).encode()
 
 
-@pytest.mark.timeout(1)
-def test_valid_yaml_source():
+def test_valid_yaml_source(valid_yaml_flags):
     """Test loading feature flags from a valid YAML file."""
-    fixture_path = get_fixture_path("valid_flags.yaml")
-
-    source = YamlSource(fixture_path)
-    flags = source.get_flags()
+    flags = valid_yaml_flags
 
     assert len(flags) == 3
     assert flags["feature1"].type.value == "boolean"
@@ -43,10 +39,9 @@ def test_valid_yaml_source():
     assert flags["feature3"].value == 500
 
 
-@pytest.mark.timeout(1)
-def test_missing_type():
+def test_missing_type(fixtures_dir):
     """Test error handling for missing type field."""
-    fixture_path = get_fixture_path("missing_type.yaml")
+    fixture_path = fixtures_dir / "missing_type.yaml"
 
     source = YamlSource(fixture_path)
     with pytest.raises(ValueError) as exc_info:
@@ -54,10 +49,9 @@ def test_missing_type():
     assert "Missing 'type' for feature flag" in str(exc_info.value)
 
 
-@pytest.mark.timeout(1)
-def test_invalid_boolean_value():
+def test_invalid_boolean_value(fixtures_dir):
     """Test error handling for invalid boolean value."""
-    fixture_path = get_fixture_path("invalid_boolean.yaml")
+    fixture_path = fixtures_dir / "invalid_boolean.yaml"
 
     source = YamlSource(fixture_path)
     with pytest.raises(ValueError) as exc_info:
@@ -65,10 +59,9 @@ def test_invalid_boolean_value():
     assert "Boolean flag must have a boolean value" in str(exc_info.value)
 
 
-@pytest.mark.timeout(1)
-def test_invalid_percentage_value():
+def test_invalid_percentage_value(fixtures_dir):
     """Test error handling for invalid percentage value."""
-    fixture_path = get_fixture_path("invalid_percentage.yaml")
+    fixture_path = fixtures_dir / "invalid_percentage.yaml"
 
     source = YamlSource(fixture_path)
     with pytest.raises(ValueError) as exc_info:
@@ -76,7 +69,6 @@ def test_invalid_percentage_value():
     assert "Percentage flag must have a numeric value" in str(exc_info.value)
 
 
-@pytest.mark.timeout(1)
 def test_nonexistent_file():
     """Test handling of nonexistent YAML file."""
     source = YamlSource("nonexistent.yaml")
@@ -84,10 +76,9 @@ def test_nonexistent_file():
     assert len(flags) == 0
 
 
-@pytest.mark.timeout(1)
-def test_yaml_specific_features():
+def test_yaml_specific_features(fixtures_dir):
     """Test YAML-specific features like anchors and aliases."""
-    fixture_path = get_fixture_path("yaml_specific.yaml")
+    fixture_path = fixtures_dir / "yaml_specific.yaml"
 
     source = YamlSource(fixture_path)
     flags = source.get_flags()
@@ -101,20 +92,18 @@ def test_yaml_specific_features():
     assert flags["feature2"].description == "Common description"
 
 
-@pytest.mark.timeout(1)
-def test_invalid_yaml():
+def test_invalid_yaml(fixtures_dir):
     """Test error handling for invalid YAML data."""
-    fixture_path = get_fixture_path("invalid.yaml")
+    fixture_path = fixtures_dir / "invalid.yaml"
 
     source = YamlSource(fixture_path)
     with pytest.raises(yaml.YAMLError):
         source.get_flags()
 
 
-@pytest.mark.timeout(1)
-def test_non_dict_values():
+def test_non_dict_values(fixtures_dir):
     """Test handling of non-dictionary values in YAML."""
-    fixture_path = get_fixture_path("non_dict_values.yaml")
+    fixture_path = fixtures_dir / "non_dict_values.yaml"
 
     source = YamlSource(fixture_path)
     flags = source.get_flags()
@@ -126,28 +115,7 @@ def test_non_dict_values():
 
 def test_valid_yaml():
     """Test valid YAML configuration."""
-    config = {
-        "feature1": {
-            "type": "boolean",
-            "value": True,
-            "description": "Test flag 1",
-        },
-        "feature2": {
-            "type": "percentage",
-            "value": MAX_PERCENTAGE / 2,
-            "description": "Test flag 2",
-        },
-        "feature3": {
-            "type": "per_thousand",
-            "value": MAX_PER_THOUSAND / 2,
-            "description": "Test flag 3",
-        },
-    }
-
-    with open("test_flags.yaml", "w") as f:
-        yaml.dump(config, f)
-
-    source = YamlSource("test_flags.yaml")
+    source = YamlSource.from_string(_VALID_YAML)
     flags = source.get_flags()
 
     assert len(flags) == 3
@@ -161,22 +129,7 @@ def test_valid_yaml():
 
 def test_common_description():
     """Test YAML configuration with common description."""
-    config = {
-        "description": "Common description",
-        "feature1": {
-            "type": "boolean",
-            "value": True,
-        },
-        "feature2": {
-            "type": "percentage",
-            "value": MAX_PERCENTAGE / 2,
-        },
-    }
-
-    with open("test_flags.yaml", "w") as f:
-        yaml.dump(config, f)
-
-    source = YamlSource("test_flags.yaml")
+    source = YamlSource.from_string(_COMMON_DESCRIPTION_YAML)
     flags = source.get_flags()
 
     assert len(flags) == 2
@@ -186,3 +139,214 @@ def test_common_description():
     assert flags["feature2"].type.value == "percentage"
     assert flags["feature2"].value == MAX_PERCENTAGE / 2
     assert flags["feature2"].description == "Common description"
+
+
+def test_from_string_invalid_yaml():
+    """Test error handling for an invalid in-memory YAML document."""
+    source = YamlSource.from_string("invalid: [yaml:\n")
+    with pytest.raises(yaml.YAMLError):
+        source.get_flags()
+
+
+def test_from_string_parallel_documents():
+    """Test that parallel mode also applies to in-memory bytes content."""
+    content = (
+        b"feature1:\n  type: boolean\n  value: true\n"
+        b"---\n"
+        b"feature2:\n  type: boolean\n  value: false\n"
+    )
+    flags = YamlSource.from_string(content, parallel=True, min_size=0).get_flags()
+    assert set(flags) == {"feature1", "feature2"}
+
+
+def test_parallel_documents(tmp_path):
+    """Test that parallel mode merges the documents of a large file."""
+    path = tmp_path / "flags.yaml"
+    path.write_text(
+        "feature1:\n  type: boolean\n  value: true\n"
+        "---\n"
+        "feature2:\n  type: percentage\n  value: 50\n"
+        "---\n"
+        "feature1:\n  type: boolean\n  value: false\n"
+    )
+
+    flags = YamlSource(str(path), parallel=True, min_size=0).get_flags()
+    assert set(flags) == {"feature1", "feature2"}
+    # Later documents override earlier ones
+    assert flags["feature1"].value is False
+    assert flags["feature2"].value == 50
+
+
+def test_parallel_below_min_size(tmp_path):
+    """Test that files under min_size merge their documents in-process."""
+    path = tmp_path / "flags.yaml"
+    path.write_text(
+        "feature1:\n  type: boolean\n  value: true\n"
+        "---\n"
+        "feature2:\n  type: boolean\n  value: false\n"
+    )
+
+    source = YamlSource(str(path), parallel=True, min_size=path.stat().st_size + 1)
+    small = source.get_flags()
+    large = YamlSource(str(path), parallel=True, min_size=0).get_flags()
+    assert {name: flag.value for name, flag in small.items()} == {
+        name: flag.value for name, flag in large.items()
+    }
+    assert set(small) == {"feature1", "feature2"}
+
+
+@pytest.mark.parametrize(
+    "separator",
+    [b"---\r\n", b"--- \n", b"--- # second document\n"],
+)
+def test_parallel_document_separators(tmp_path, separator):
+    """Test that parallel mode merges documents whatever their start line."""
+    first = b"feature1:\n  type: boolean\n  value: true\n"
+    second = b"feature2:\n  type: boolean\n  value: false\n"
+    if separator.endswith(b"\r\n"):
+        first, second = (part.replace(b"\n", b"\r\n") for part in (first, second))
+    path = tmp_path / "flags.yaml"
+    path.write_bytes(first + separator + second)
+
+    flags = YamlSource(str(path), parallel=True, min_size=0).get_flags()
+    assert set(flags) == {"feature1", "feature2"}
+
+
+def test_parallel_directives(tmp_path):
+    """Test that documents with directives parse the same in workers."""
+    path = tmp_path / "flags.yaml"
+    path.write_text(
+        "%YAML 1.1\n---\nfeature1:\n  type: boolean\n  value: true\n"
+        "...\n%YAML 1.1\n---\nfeature2:\n  type: boolean\n  value: false\n"
+    )
+
+    flags = YamlSource(str(path), parallel=True, min_size=0).get_flags()
+    assert set(flags) == {"feature1", "feature2"}
+
+
+def test_parallel_mode_imports_workers_lazily():
+    """Test that importing the source does not load multiprocessing."""
+    code = (
+        "import sys, aflags.sources.yaml; "
+        "sys.exit('concurrent.futures.process' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+
+def test_parallel_invalid_document(tmp_path):
+    """Test that an invalid document fails the whole parallel parse."""
+    path = tmp_path / "flags.yaml"
+    path.write_text("feature1:\n  type: boolean\n  value: true\n---\ninvalid: [yaml:\n")
+
+    with pytest.raises(yaml.YAMLError) as exc_info:
+        YamlSource(str(path), parallel=True, min_size=0).get_flags()
+    assert "Invalid YAML file" in str(exc_info.value)
+
+
+def test_fast_loader(valid_yaml_flags, fixtures_dir):
+    """Test that fast mode loads the same flags as the safe loader."""
+    source = YamlSource(fixtures_dir / "valid_flags.yaml", fast=True)
+    flags = source.get_flags()
+
+    assert {name: flag.value for name, flag in flags.items()} == {
+        name: flag.value for name, flag in valid_yaml_flags.items()
+    }
+    assert flags["feature1"].value is True
+    assert flags["feature2"].description == "Test feature 2"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("true", True),
+        ("Off", False),
+        ("50", 50),
+        ("+50", 50),
+        ("2.5", 2.5),
+        (".5", 0.5),
+        ("5.", 5.0),
+    ],
+)
+def test_fast_loader_coerces_values(value, expected):
+    """Test that fast mode converts string scalars to booleans and numbers."""
+    flag_type = "boolean" if isinstance(expected, bool) else "percentage"
+    content = f"feature1:\n  type: {flag_type}\n  value: {value}\n"
+    flags = YamlSource.from_string(content, fast=True).get_flags()
+
+    assert flags["feature1"].value == expected
+    assert type(flags["feature1"].value) is type(expected)
+
+
+@pytest.mark.parametrize("spelling", ["~", "null", "Null", "NULL", ""])
+def test_fast_loader_null_values(spelling):
+    """Test that fast mode reads YAML null spellings as None, like SafeLoader."""
+    content = f"feature1:\n  type: boolean\n  value: {spelling}\n"
+    for fast in (False, True):
+        with pytest.raises(ValueError) as exc_info:
+            YamlSource.from_string(content, fast=fast).get_flags()
+        assert "Missing required field 'value'" in str(exc_info.value)
+
+    content = f"feature1:\n  type: boolean\n  value: true\n  description: {spelling}\n"
+    for fast in (False, True):
+        flags = YamlSource.from_string(content, fast=fast).get_flags()
+        assert flags["feature1"].description is None
+
+
+@pytest.mark.parametrize(
+    "flag_type, value",
+    [
+        ("percentage", "010"),
+        ("percentage", "+.5"),
+        ("percentage", "1_0"),
+        ("percentage", "0x10"),
+        ("boolean", "tRuE"),
+    ],
+)
+def test_fast_loader_rejects_values_safe_loader_reads_differently(flag_type, value):
+    """Test that fast mode rejects values rather than converting them wrongly."""
+    content = f"feature1:\n  type: {flag_type}\n  value: {value}\n"
+    with pytest.raises(ValueError):
+        YamlSource.from_string(content, fast=True).get_flags()
+
+
+def test_fast_loader_converts_quoted_values():
+    """Test that fast mode cannot tell quoted values from plain ones."""
+    content = 'feature1:\n  type: percentage\n  value: "50"\n'
+    with pytest.raises(ValueError):
+        YamlSource.from_string(content).get_flags()
+    assert (
+        YamlSource.from_string(content, fast=True).get_flags()["feature1"].value == 50
+    )
+
+
+def test_fast_loader_ignores_merge_keys(fixtures_dir):
+    """Test that fast mode does not apply "<<" merge keys."""
+    source = YamlSource(fixtures_dir / "yaml_specific.yaml", fast=True)
+    flags = source.get_flags()
+
+    assert flags["feature1"].value is True
+    assert flags["feature1"].description is None
+
+
+def test_fast_loader_streams_flat_documents(fixtures_dir):
+    """Test that flat documents stream to what the base loader would load."""
+    for content in (
+        (fixtures_dir / "valid_flags.yaml").read_bytes(),
+        _COMMON_DESCRIPTION_YAML,
+    ):
+        assert _load_events(content) == yaml.load(content, Loader=yaml.BaseLoader)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "common: &on\n  type: boolean\nfeature1: *on\n",
+        "feature1:\n  type: boolean\n  value: [true]\n",
+        "feature1: {type: boolean, value: true}\n---\nfeature2: {}\n",
+        "- feature1\n",
+        "",
+    ],
+)
+def test_fast_loader_falls_back_to_base_loader(content):
+    """Test that documents the event stream cannot build go to the loader."""
+    assert _load_events(content) is None